@@ -7,17 +7,19 @@ Usage (in GitHub Actions):
     GITHUB_REPOSITORY: owner/repo
     GITHUB_EVENT_PATH: path to event json (built-in)
     GITHUB_TOKEN: token
-  python .github/scripts/check_pr_commits.py
+  python .github/scripts/check_pr_commits.py [--no-fail-fast]
 
 This script:
 - If running on a pull_request event, fetches the commits of the PR and ensures each commit message contains a JIRA key.
 - If running on push, checks commits in push payload similarly (optional).
 """
+import argparse
 import os
 import re
 import sys
 import json
-import requests
+
+from github_api import get_client
 
 JIRA_RE = re.compile(r'([A-Za-z][A-Za-z0-9]+-\d+)', re.IGNORECASE)
 
@@ -30,12 +32,17 @@ def get_event():
         return json.load(f)
 
 def github_api_get(url, token):
-    headers = {"Authorization": f"Bearer {token}", "Accept": "application/vnd.github.v3+json"}
-    r = requests.get(url, headers=headers)
-    r.raise_for_status()
-    return r.json()
+    return get_client(token).get(url)
+
+def github_api_get_all(url, total, token):
+    return get_client(token).get_all(url, total)
 
 def main():
+    p = argparse.ArgumentParser(description="Check that every PR commit message references a JIRA key.")
+    p.add_argument("--fail-fast", action=argparse.BooleanOptionalAction, default=True,
+                   help="stop at the first failing commit (default: on)")
+    args = p.parse_args()
+
     token = os.environ.get("GITHUB_TOKEN")
     if not token:
         print("GITHUB_TOKEN missing", file=sys.stderr)
@@ -47,7 +54,7 @@ def main():
         repo = event["repository"]["full_name"]
         pr_number = pr["number"]
         commits_url = pr["commits_url"]
-        commits = github_api_get(commits_url, token)
+        commits = github_api_get_all(commits_url, pr.get("commits", 0), token)
         # Extract JIRA key candidate from PR title
         pr_title = pr.get("title", "")
         prs = JIRA_RE.search(pr_title)
@@ -55,13 +62,15 @@ def main():
         errs = []
         for c in commits:
             msg = c.get("commit", {}).get("message", "")
-            m = JIRA_RE.search(msg)
+            # every JIRA key contains "-", so skip the regex when there can't be one
+            m = JIRA_RE.search(msg) if "-" in msg else None
             if not m:
                 errs.append(f"Commit {c.get('sha')[:7]} missing JIRA key in message.")
-            else:
-                # optional: ensure commit JIRA equals PR JIRA if PR contains one
-                if header_jira and m.group(1).upper() != header_jira.upper():
-                    errs.append(f"Commit {c.get('sha')[:7]} JIRA {m.group(1)} does not match PR JIRA {header_jira}.")
+            # optional: ensure commit JIRA equals PR JIRA if PR contains one
+            elif header_jira and m.group(1).upper() != header_jira:
+                errs.append(f"Commit {c.get('sha')[:7]} JIRA {m.group(1)} does not match PR JIRA {header_jira}.")
+            if errs and args.fail_fast:
+                break
         if errs:
             print("Commit JIRA checks failed:")
             for e in errs:
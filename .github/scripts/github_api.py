@@ -0,0 +1,246 @@
+"""
+github_api.py
+
+Shared GitHub REST helpers for the scripts in this directory and for
+scripts/spypip_jira_notifier.py, which puts this directory on sys.path.
+
+GET responses are cached on disk together with their ETag and revalidated with
+If-None-Match, so repeated CI runs over the same PR are answered with HTTP 304
+(which does not count against the REST rate limit) instead of a full payload.
+
+Rate-limited (403/429) and 5xx responses are retried with exponential backoff,
+honouring Retry-After and, for an exhausted quota, X-RateLimit-Reset. A 403 that
+is not a rate limit is a permission error and is returned without retrying.
+Once fewer than RATE_LIMIT_FLOOR requests remain in the current window the
+session sleeps until it resets instead of failing the job.
+
+Environment:
+  SPYPIP_CACHE_DIR  overrides the cache location (default: ~/.cache/spypip)
+"""
+import asyncio
+import atexit
+import functools
+import json
+import math
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import MaxRetryError, ResponseError
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:  # optional: stdlib json is only slower
+    json_loads = json.loads
+
+GITHUB_API = "https://api.github.com"
+
+RETRY_STATUSES = (403, 429, 502, 503, 504)
+MAX_RETRIES = 5
+RETRY_BACKOFF = 1.0
+# Below this many remaining requests, wait for the rate-limit window to reset.
+RATE_LIMIT_FLOOR = 50
+
+# Largest page size GitHub list endpoints accept.
+PER_PAGE = 100
+
+CACHE_DIR = Path(os.environ.get("SPYPIP_CACHE_DIR") or Path.home() / ".cache" / "spypip")
+ETAG_CACHE_PATH = CACHE_DIR / "gh.json"
+# actions/cache saves a fresh copy every run, so bound what gets carried forward.
+ETAG_CACHE_MAX_AGE = 30 * 24 * 3600  # seconds since an entry was last used
+ETAG_CACHE_MAX_ENTRIES = 2000
+
+
+def rate_limit_pause(headers):
+    """Seconds to wait before the next call: until the window resets once few requests remain."""
+    remaining = headers.get("X-RateLimit-Remaining")
+    reset = headers.get("X-RateLimit-Reset")
+    if remaining is None or reset is None or int(remaining) >= RATE_LIMIT_FLOOR:
+        return 0.0
+    return max(0.0, int(reset) - time.time())
+
+
+def _wait_for_rate_limit(response, **_kwargs):
+    """requests response hook: sleep until the window resets once few requests remain."""
+    delay = rate_limit_pause(response.headers)
+    if delay:
+        print(f"GitHub rate limit nearly exhausted; sleeping {delay:.0f}s", file=sys.stderr)
+        time.sleep(delay)
+
+
+async def await_rate_limit(response):
+    """httpx response hook with the same behaviour as _wait_for_rate_limit."""
+    delay = rate_limit_pause(response.headers)
+    if delay:
+        print(f"GitHub rate limit nearly exhausted; sleeping {delay:.0f}s", file=sys.stderr)
+        await asyncio.sleep(delay)
+
+
+def is_rate_limited(headers):
+    """GitHub signals its secondary limit with Retry-After and the primary one with 0 remaining."""
+    return "Retry-After" in headers or headers.get("X-RateLimit-Remaining") == "0"
+
+
+def should_retry(status, headers):
+    """A 403 is only retried when it is a rate limit; otherwise it is a permission error."""
+    if status == 403:
+        return is_rate_limited(headers)
+    return status in RETRY_STATUSES
+
+
+def rate_limit_delay(headers):
+    """Seconds GitHub asks us to wait: Retry-After, or until the reset once the quota is exhausted."""
+    if headers.get("Retry-After", "").isdigit():
+        return float(headers["Retry-After"])
+    if headers.get("X-RateLimit-Remaining") == "0" and headers.get("X-RateLimit-Reset"):
+        return max(0.0, int(headers["X-RateLimit-Reset"]) - time.time())
+    return None
+
+
+def retry_delay(headers, attempt):
+    """Back-off before retrying: rate_limit_delay() when GitHub gives one, else exponential."""
+    delay = rate_limit_delay(headers)
+    return RETRY_BACKOFF * 2 ** attempt if delay is None else delay
+
+
+class GitHubRetry(Retry):
+    """
+    urllib3 Retry with should_retry()/rate_limit_delay() semantics, so requests sessions
+    retry exactly what the retry_delay() loops of async callers do.
+    """
+
+    def increment(self, method=None, url=None, response=None, *args, **kwargs):
+        if response is not None and response.status == 403 and not is_rate_limited(response.headers):
+            # with raise_on_status=False urllib3 hands this response back instead of retrying it
+            raise MaxRetryError(kwargs.get("_pool"), url, ResponseError("403 is not a rate limit"))
+        return super().increment(method, url, response, *args, **kwargs)
+
+    def get_retry_after(self, response):
+        return rate_limit_delay(response.headers)
+
+
+def make_session(headers):
+    """Pooled GitHub session: one TLS connection reused by every call, with retries."""
+    retry = GitHubRetry(
+        total=MAX_RETRIES,
+        backoff_factor=RETRY_BACKOFF,
+        status_forcelist=list(RETRY_STATUSES),
+        respect_retry_after_header=True,
+        # return the last response once retries run out, so callers see its real status
+        raise_on_status=False,
+    )
+    session = requests.Session()
+    session.headers.update(headers)
+    session.mount(GITHUB_API, HTTPAdapter(pool_connections=20, pool_maxsize=20, max_retries=retry))
+    session.hooks["response"].append(_wait_for_rate_limit)
+    return session
+
+
+class CachedGitHubClient:
+    """
+    GitHub GET client backed by a persistent {url: (etag, json, last_used)} cache.
+    Cached URLs are re-requested with If-None-Match and served from the cache on HTTP 304.
+    Entries unused for ETAG_CACHE_MAX_AGE are dropped, and at most
+    ETAG_CACHE_MAX_ENTRIES of the most recently used ones are kept.
+    conditional_headers()/needs_refetch()/remember() let async callers share the cache.
+    """
+
+    def __init__(self, session, cache_path=ETAG_CACHE_PATH):
+        self.session = session
+        self.cache_path = cache_path
+        self.etags = {}
+        self.bodies = {}
+        self.used = {}
+        self._dirty = False
+        self._load()
+        atexit.register(self.save)
+
+    def _load(self):
+        try:
+            data = json_loads(self.cache_path.read_bytes())
+        except (OSError, ValueError):
+            return
+        cutoff = time.time() - ETAG_CACHE_MAX_AGE
+        # entries from before last_used was recorded have no timestamp and are dropped
+        fresh = [(url, entry) for url, entry in data.items() if len(entry) == 3 and entry[2] >= cutoff]
+        fresh.sort(key=lambda item: item[1][2], reverse=True)
+        for url, (etag, body, used) in fresh[:ETAG_CACHE_MAX_ENTRIES]:
+            self.etags[url] = etag
+            self.bodies[url] = body
+            self.used[url] = used
+        self._dirty = len(self.etags) < len(data)
+
+    def conditional_headers(self, url):
+        etag = self.etags.get(url)
+        return {"If-None-Match": etag} if etag else {}
+
+    def needs_refetch(self, url, response):
+        """True for a 304 there is no cached body to serve; re-request without If-None-Match."""
+        return response.status_code == 304 and url not in self.bodies
+
+    def remember(self, url, response):
+        """Return the JSON body for a requests/httpx response, updating the cache."""
+        if response.status_code == 304 and url in self.bodies:
+            self.used[url] = time.time()
+            self._dirty = True
+            return self.bodies[url]
+        response.raise_for_status()
+        body = json_loads(response.content)
+        if response.headers.get("ETag"):
+            self.etags[url] = response.headers["ETag"]
+            self.bodies[url] = body
+            self.used[url] = time.time()
+            self._dirty = True
+        return body
+
+    def get(self, url):
+        r = self.session.get(url, headers=self.conditional_headers(url))
+        if self.needs_refetch(url, r):
+            r = self.session.get(url)
+        return self.remember(url, r)
+
+    def get_all(self, url, total):
+        """
+        Fetch every page of a list endpoint whose item count is known up front
+        (e.g. a PR's `commits` or `changed_files`), requesting the pages concurrently.
+        """
+        pages = max(1, math.ceil(total / PER_PAGE))
+        sep = "&" if "?" in url else "?"
+        urls = [f"{url}{sep}per_page={PER_PAGE}&page={n}" for n in range(1, pages + 1)]
+        with ThreadPoolExecutor(max_workers=min(pages, 8)) as ex:
+            return [item for page in ex.map(self.get, urls) for item in page]
+
+    def save(self):
+        if not self._dirty:
+            return
+        newest = sorted(self.etags, key=self.used.get, reverse=True)[:ETAG_CACHE_MAX_ENTRIES]
+        data = {url: (self.etags[url], self.bodies[url], self.used[url]) for url in newest}
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            # a private temp file, so concurrent runs never write into each other's copy
+            fd, tmp = tempfile.mkstemp(dir=self.cache_path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp, self.cache_path)
+        except OSError as e:
+            # the cache is an optimization only; never fail a run over it
+            print(f"Warning: could not write GitHub cache {self.cache_path}: {e}", file=sys.stderr)
+            return
+        self._dirty = False
+
+
+# One pooled session per process so every call reuses the same TLS connection.
+_SESSION = make_session({"Accept": "application/vnd.github.v3+json"})
+
+
+@functools.lru_cache(maxsize=None)
+def get_client(token):
+    _SESSION.headers["Authorization"] = f"Bearer {token}"
+    return CachedGitHubClient(_SESSION)
@@ -21,19 +21,70 @@ import json
 import argparse
 import requests
 
+from github_api import get_client, json_loads
+
 JIRA_RE = re.compile(r'([A-Za-z][A-Za-z0-9]+-\d+)', re.IGNORECASE)
 
 def gh_api(url, token, method="GET", json_body=None):
-    headers = {"Authorization": f"Bearer {token}", "Accept": "application/vnd.github.v3+json"}
+    client = get_client(token)
     if method == "GET":
-        r = requests.get(url, headers=headers)
+        return client.get(url)
     elif method == "POST":
-        headers["Content-Type"] = "application/json"
-        r = requests.post(url, headers=headers, json=json_body)
+        # json= sets Content-Type, and the session already carries the auth headers
+        r = client.session.post(url, json=json_body)
     else:
         raise ValueError("Unsupported method")
     r.raise_for_status()
-    return r.json()
+    return json_loads(r.content)
+
+def _jira_in_diff(session, pr_api_url):
+    """First JIRA key in a line the PR's combined diff leaves in place under patches/."""
+    r = session.get(pr_api_url, headers={"Accept": "application/vnd.github.v3.diff"}, stream=True)
+    r.raise_for_status()
+    in_patches = False
+    with r:
+        for raw in r.iter_lines(chunk_size=64 * 1024):
+            line = raw.decode("utf-8", errors="replace")
+            if line.startswith("diff --git "):
+                in_patches = line.rsplit(" b/", 1)[-1].startswith("patches/")
+                continue
+            # skip removed lines and the ---/+++/@@ diff headers
+            if not in_patches or line.startswith(("-", "+++", "@@")):
+                continue
+            m = JIRA_RE.search(line)
+            if m:
+                return m.group(1)
+    return None
+
+def _jira_in_patch_contents(client, pr):
+    """First JIRA key in the full contents of the PR's patches/ files, streamed one at a time."""
+    files = client.get_all(pr["url"] + "/files", pr.get("changed_files", 0))
+    for f in files:
+        if not f.get("filename", "").startswith("patches/") or f.get("status") == "removed":
+            continue
+        with client.session.get(f["raw_url"], stream=True) as r:
+            if not r.ok:
+                continue
+            for raw in r.iter_lines(chunk_size=64 * 1024):
+                m = JIRA_RE.search(raw.decode("utf-8", errors="replace"))
+                if m:
+                    return m.group(1)
+    return None
+
+def find_jira_in_patch_files(pr, token):
+    """
+    Return the first JIRA key found in a file under patches/.
+    The combined diff is tried first since it is one request, but its hunks only carry a few
+    lines of context around each change, so a header far from the edit is not in it, and GitHub
+    refuses the diff (406) for very large PRs. In either case the patch files are read in full.
+    """
+    client = get_client(token)
+    try:
+        jira = _jira_in_diff(client.session, pr["url"])
+    except requests.RequestException as e:
+        print(f"Could not fetch PR diff ({e}); reading patch files instead", file=sys.stderr)
+        jira = None
+    return jira or _jira_in_patch_contents(client, pr)
 
 def post_pr_comment(repo, pr_number, token, body):
     url = f"https://api.github.com/repos/{repo}/issues/{pr_number}/comments"
@@ -60,7 +111,7 @@ def create_jira_issue(summary, description, project_key, issue_type, dry_run=Tru
     url = jira_base.rstrip("/") + "/rest/api/3/issue"
     r = requests.post(url, auth=(jira_user, jira_token), json=payload, headers={"Content-Type": "application/json"})
     r.raise_for_status()
-    return r.json()
+    return json_loads(r.content)
 
 def main():
     p = argparse.ArgumentParser()
@@ -85,19 +136,7 @@ def main():
         sys.exit(0)
 
     # search patch files for JIRA
-    files_url = pr.get("url") + "/files"
-    files = gh_api(files_url, gh_token)
-    jira_found = None
-    for f in files:
-        if f.get("filename","").startswith("patches/"):
-            # fetch file raw contents
-            raw_url = f.get("raw_url")
-            r = requests.get(raw_url)
-            if r.ok:
-                mm = JIRA_RE.search(r.text)
-                if mm:
-                    jira_found = mm.group(1)
-                    break
+    jira_found = find_jira_in_patch_files(pr, gh_token)
 
     if jira_found:
         body = f"Found JIRA {jira_found} in patch file — please include it in PR title for traceability.\n\nSuggested title: `{jira_found}: short summary`"
@@ -9,70 +9,70 @@ If no args given, scans the "patches/" directory for *.patch and *.diff files.
 
 Exit code 0 on success, non-zero on validation failures.
 """
+import itertools
 import os
 import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, Iterable, List
 
 JIRA_RE = re.compile(r"([A-Za-z][A-Za-z0-9]+-\d+)")
 REQUIRED_KEYS = ["JIRA", "Upstream", "Title", "Author", "Date", "Description"]
+# Below this many files, process start-up costs more than validating serially.
+PARALLEL_MIN_FILES = 4
+_HEADER_RE = re.compile(r'^([A-Za-z]+):\s*(.*)$')
+_DIFF_RE = re.compile(r'^(?:diff |\+\+\+ |--- |@@ )')
 
-def parse_header(lines: List[str]) -> Tuple[Dict[str, str], List[str]]:
+def parse_header(lines: Iterable[str]) -> Dict[str, str]:
     """
-    Parse the header until the first blank line followed by a line that looks like a diff (starts with diff/+++/---/@@)
-    Returns (fields, remaining_lines)
+    Parse the header until the first line that looks like a diff (starts with diff/+++/---/@@).
+    Lines are consumed lazily, so nothing past the diff marker is read.
+    Returns the header fields.
     """
     fields = {}
     desc_lines = []
-    i = 0
+    in_description = False
     # skip leading comments/pound-lines but accept header keys anywhere at top
-    while i < len(lines):
-        line = lines[i].rstrip("\n")
+    for raw in lines:
+        line = raw.rstrip("\n")
+        if _DIFF_RE.match(line):
+            # header is over once the diff starts
+            break
         if line.strip() == "":
-            # blank line - but continue scanning until we hit diff lines
-            i += 1
-            # if next lines start with diff, break
-            if i < len(lines) and re.match(r'^(diff |\+\+\+ |--- |@@ )', lines[i]):
-                break
+            # blank line ends a description; keep scanning for more header keys
+            in_description = False
+            continue
+        if in_description:
+            # collect following lines as description until blank or diff
+            desc_lines.append(line)
             continue
         # header keys
-        m = re.match(r'^([A-Za-z]+):\s*(.*)$', line)
+        m = _HEADER_RE.match(line)
         if m:
             key, value = m.group(1), m.group(2)
             key = key.strip()
             if key == "Description":
-                # collect indented following lines as description until blank or diff
-                j = i + 1
                 if value:
                     desc_lines.append(value)
-                while j < len(lines):
-                    ln = lines[j]
-                    if re.match(r'^(diff |\+\+\+ |--- |@@ )', ln) or ln.strip() == "":
-                        break
-                    desc_lines.append(ln.rstrip("\n"))
-                    j += 1
-                fields["Description"] = "\n".join([l.strip() for l in desc_lines]).strip()
-                i = j
-                continue
+                # joined once after the loop; set now so the key exists even when empty
+                fields["Description"] = ""
+                in_description = True
             else:
                 fields[key] = value.strip()
-        else:
-            # ignore comments and other lines until diff
-            if re.match(r'^(diff |\+\+\+ |--- |@@ )', line):
-                break
-        i += 1
-    remaining = lines[i:]
-    return fields, remaining
+        # ignore comments and other lines until diff
+    if "Description" in fields:
+        fields["Description"] = "\n".join(part.strip() for part in desc_lines).strip()
+    return fields
 
 def validate_patch_file(path: Path) -> List[str]:
     errors = []
     with path.open('r', encoding='utf-8', errors='replace') as f:
-        lines = f.readlines()
-    if not lines:
-        errors.append("Empty file")
-        return errors
-    fields, _ = parse_header(lines)
+        first = f.readline()
+        if not first:
+            errors.append("Empty file")
+            return errors
+        fields = parse_header(itertools.chain([first], f))
     # check required keys
     for key in REQUIRED_KEYS:
         if key not in fields or not fields[key].strip():
@@ -105,10 +105,15 @@ def main(argv):
         print("No patch files found.", file=sys.stderr)
         return 1
 
+    if len(files) < PARALLEL_MIN_FILES:
+        results = [validate_patch_file(f) for f in files]
+    else:
+        with ProcessPoolExecutor() as ex:
+            results = list(ex.map(validate_patch_file, files, chunksize=4))
+
     overall_failed = False
-    for f in files:
+    for f, errs in zip(files, results):
         print(f"Validating {f} ...")
-        errs = validate_patch_file(f)
         if errs:
             overall_failed = True
             print(f"  ✖ {len(errs)} error(s) in {f}:")
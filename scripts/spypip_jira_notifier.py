@@ -5,7 +5,9 @@ spypip_jira_notifier.py
 Detect packaging-related changes between two refs/tags in a GitHub repo and create Jira issues for them.
 
 Requirements:
-    pip install requests python-dotenv
+    pip install requests httpx python-dotenv
+    pip install orjson  # optional, faster decoding of large compare/commit payloads
+    pip install "httpx[http2]"  # optional, multiplexes commit fetches over one connection
 
 Usage:
     export GITHUB_TOKEN=ghp_xxx
@@ -17,16 +19,43 @@ Usage:
 
 Notes:
     - This script calls the GitHub compare API to fetch aggregated file changes.
+    - Per-commit details are fetched concurrently (see COMMIT_FETCH_CONCURRENCY).
+    - GitHub GET responses are cached with their ETag under ~/.cache/spypip
+      (override with SPYPIP_CACHE_DIR) and revalidated with If-None-Match.
+      Commit details are immutable, so they are stored by repo and SHA under
+      commits/ and never refetched; entries unused for COMMIT_CACHE_MAX_AGE are pruned.
+    - With --local-clone PATH, commits are read from an existing clone with git
+      instead of the GitHub API (GITHUB_TOKEN is then not needed).
     - Jira API uses basic auth with email:api_token (Atlassian Cloud).
 """
+from __future__ import annotations
+
 import os
 import sys
 import argparse
-import requests
+import asyncio
+import functools
+import importlib.util
+import json
+import math
+import re
+import subprocess
+import tempfile
+import time
 import fnmatch
-import base64
-import textwrap
-from typing import List, Dict
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, List, Dict, Optional, Set, Tuple
+
+# The GitHub client, retry policy and JSON decoding are shared with the CI scripts.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / ".github" / "scripts"))
+
+# github_api (which loads requests) and httpx are imported where first needed.
+# --help and --local-clone --dry-run runs load neither. GitHub mode always loads
+# requests for the compare call; httpx is only loaded once commits or further
+# compare pages have to be fetched.
+if TYPE_CHECKING:
+    import httpx
+    from github_api import CachedGitHubClient
 
 DEFAULT_PATTERNS = [
     "requirements.txt",
@@ -46,95 +75,265 @@ DEFAULT_PATTERNS = [
 
 GITHUB_API = "https://api.github.com"
 
+# Capped fan-out for per-commit fetches; higher values mostly trip GitHub's
+# secondary rate limits without improving wall-clock time.
+COMMIT_FETCH_CONCURRENCY = 10
+
+# Largest page size the compare endpoint accepts once paginated.
+COMPARE_PER_PAGE = 100
+# The compare endpoint lists at most this many files; a full list may be truncated.
+COMPARE_FILES_LIMIT = 300
+
+# Jira accepts at most this many issueUpdates per bulk-create request.
+JIRA_BULK_LIMIT = 50
+
+# `git log --name-status` letters mapped to the GitHub file 'status' values.
+GIT_STATUS_NAMES = {
+    "A": "added",
+    "M": "modified",
+    "D": "removed",
+    "R": "renamed",
+    "C": "copied",
+    "T": "changed",
+}
+
+# next to github_api's ETag cache (gh.json), under the same SPYPIP_CACHE_DIR
+COMMIT_CACHE_DIR = Path(os.environ.get("SPYPIP_CACHE_DIR") or Path.home() / ".cache" / "spypip") / "commits"
+COMMIT_CACHE_MAX_AGE = 90 * 24 * 3600
+
 def get_github_headers(token: str):
     return {"Authorization": f"token {token}", "Accept": "application/vnd.github.v3+json"}
 
-def compare_refs(owner_repo: str, base: str, head: str, token: str) -> Dict:
-    owner, repo = owner_repo.split("/")
-    url = f"{GITHUB_API}/repos/{owner}/{repo}/compare/{base}...{head}"
-    r = requests.get(url, headers=get_github_headers(token))
-    r.raise_for_status()
-    return r.json()
+def _commit_cache_path(repo_id: Tuple[str, str], sha: str) -> Path:
+    # keyed by repo too: forks share SHAs with upstream, but the payload's URLs are repo-specific
+    owner, repo = repo_id
+    return COMMIT_CACHE_DIR / owner / repo / sha[:2] / f"{sha}.json"
 
-def commit_details(owner_repo: str, sha: str, token: str) -> Dict:
-    owner, repo = owner_repo.split("/")
-    url = f"{GITHUB_API}/repos/{owner}/{repo}/commits/{sha}"
-    r = requests.get(url, headers=get_github_headers(token))
-    r.raise_for_status()
-    return r.json()
+def load_cached_commit(repo_id: Tuple[str, str], sha: str) -> Optional[Dict]:
+    from github_api import json_loads
+
+    path = _commit_cache_path(repo_id, sha)
+    try:
+        detail = json_loads(path.read_bytes())
+        # bump mtime so pruning only drops commits no recent run has needed
+        os.utime(path)
+    except (OSError, ValueError):
+        return None
+    return detail
+
+def store_cached_commit(repo_id: Tuple[str, str], sha: str, detail: Dict):
+    path = _commit_cache_path(repo_id, sha)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(detail, f)
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"Warning: could not cache commit {sha}: {e}", file=sys.stderr)
+
+def prune_commit_cache(max_age: int = COMMIT_CACHE_MAX_AGE):
+    cutoff = time.time() - max_age
+    # rglob also ages out entries from the older commits/<sha[:2]>/ layout
+    for path in COMMIT_CACHE_DIR.rglob("*.json"):
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+        except OSError:
+            continue
+
+async def fetch_json(client: httpx.AsyncClient, cache: Optional[CachedGitHubClient], url: str,
+                     sem: asyncio.Semaphore) -> Any:
+    import github_api
+
+    for attempt in range(github_api.MAX_RETRIES + 1):
+        async with sem:
+            r = await client.get(url, headers=cache.conditional_headers(url) if cache else None)
+        if not github_api.should_retry(r.status_code, r.headers) or attempt == github_api.MAX_RETRIES:
+            break
+        await asyncio.sleep(github_api.retry_delay(r.headers, attempt))
+    if cache is None:
+        r.raise_for_status()
+        return github_api.json_loads(r.content)
+    if cache.needs_refetch(url, r):
+        async with sem:
+            r = await client.get(url)
+    return cache.remember(url, r)
+
+async def fetch_all(cache: Optional[CachedGitHubClient], urls: List[str],
+                    headers: Dict[str, str]) -> List:
+    """
+    GET all URLs concurrently (at most COMMIT_FETCH_CONCURRENCY in flight), through the ETag
+    cache unless cache is None. Responses github_api.should_retry() accepts are retried up to
+    github_api.MAX_RETRIES times.
+    Returns one entry per URL, in order: the JSON body or the exception raised while fetching it.
+    """
+    import httpx
+    from github_api import await_rate_limit
+
+    sem = asyncio.Semaphore(COMMIT_FETCH_CONCURRENCY)
+    limits = httpx.Limits(max_keepalive_connections=20, max_connections=100)
+    # httpx only speaks HTTP/2 with the optional h2 package; otherwise stay on HTTP/1.1
+    http2 = importlib.util.find_spec("h2") is not None
+    async with httpx.AsyncClient(base_url=GITHUB_API, headers=headers,
+                                 http2=http2, limits=limits,
+                                 event_hooks={"response": [await_rate_limit]}) as client:
+        return await asyncio.gather(
+            *[fetch_json(client, cache, url, sem) for url in urls],
+            return_exceptions=True,
+        )
+
+def compare_refs(client: CachedGitHubClient, repo_id: Tuple[str, str], base: str, head: str,
+                 headers: Dict[str, str]) -> Dict:
+    """
+    Compare two refs, following pagination so ranges over 250 commits aren't truncated.
+    Page 1 reports total_commits, so the remaining pages are fetched concurrently.
+    Returns the page-1 payload (which holds the aggregated 'files') with every page's commits.
+    """
+    owner, repo = repo_id
+    url = f"{GITHUB_API}/repos/{owner}/{repo}/compare/{base}...{head}?per_page={COMPARE_PER_PAGE}"
+    compare_json = client.get(f"{url}&page=1")
+    pages = math.ceil(compare_json.get("total_commits", 0) / COMPARE_PER_PAGE)
+    if pages <= 1:
+        return compare_json
+    rest = asyncio.run(fetch_all(client, [f"{url}&page={n}" for n in range(2, pages + 1)], headers))
+    commits = list(compare_json.get("commits", []))
+    for page in rest:
+        if isinstance(page, Exception):
+            raise page
+        commits.extend(page.get("commits", []))
+    return {**compare_json, "commits": commits}
+
+async def fetch_commits(repo_id: Tuple[str, str], shas: List[str], headers: Dict[str, str]) -> List:
+    """
+    Fetch commit details for all SHAs, serving them from the on-disk commit cache where
+    possible and fetching the rest concurrently.
+    Returns one entry per SHA, in order: the commit JSON or the exception raised while fetching it.
+    """
+    owner, repo = repo_id
+    details = {sha: load_cached_commit(repo_id, sha) for sha in shas}
+    missing = [sha for sha, detail in details.items() if detail is None]
+    if not missing:
+        # a rerun over an already-seen range makes no GitHub requests for commits at all
+        return [details[sha] for sha in shas]
+    commits_url = f"{GITHUB_API}/repos/{owner}/{repo}/commits/"
+    urls = [commits_url + sha for sha in missing]
+    # commits are immutable, so skip ETag revalidation and cache by SHA instead
+    for sha, detail in zip(missing, await fetch_all(None, urls, headers)):
+        if not isinstance(detail, Exception):
+            store_cached_commit(repo_id, sha, detail)
+        details[sha] = detail
+    return [details[sha] for sha in shas]
+
+@functools.lru_cache(maxsize=None)
+def _build_matcher(patterns: Tuple[str, ...]) -> "re.Pattern[str]":
+    """Compile all glob patterns into one regex alternation (fnmatch re-translates them per call)."""
+    return re.compile("|".join(f"(?:{fnmatch.translate(p)})" for p in patterns))
 
 def matches_patterns(path: str, patterns: List[str]) -> bool:
-    for p in patterns:
-        if fnmatch.fnmatch(path, p):
-            return True
-    return False
+    return _build_matcher(tuple(patterns)).match(path) is not None
 
-def find_packaging_commits(compare_json: Dict, patterns: List[str]) -> List[Dict]:
+def github_commit_details(repo_id: Tuple[str, str], base: str, head: str, patterns: List[str],
+                          headers: Dict[str, str]) -> Tuple[List[Tuple[str, Any]], Optional[Set[str]]]:
     """
-    Use the 'files' array from the compare endpoint if available (overall diff),
-    otherwise fall back to checking each commit's files.
-    Returns a list of dicts: { 'sha', 'html_url', 'author', 'commit_message', 'files_changed': [ ... ] }
+    Fetch details for the commits in base...head that may touch packaging files.
+    Returns ((sha, commit JSON or the exception raised while fetching it) pairs, packaging_paths),
+    where packaging_paths holds the range's packaging files, or None if the compare file list
+    was truncated and each commit's files must be pattern-matched instead.
     """
-    owner_repo = compare_json.get("url", "")
-    commits = compare_json.get("commits", [])
-    results = []
+    from github_api import CachedGitHubClient, make_session
 
-    # Try to use compare_json['files'] if available (some compare responses include files aggregated)
-    # But to be robust, query each commit for its files
-    for c in commits:
-        sha = c.get("sha")
-        # fetch commit details to get files and patches
-        try:
-            detail = commit_details_from_compare(c)
-        except Exception:
-            detail = None
-
-        # commit_details_from_compare returns a dict with files if commit payload includes them,
-        # otherwise we call the GitHub API commit endpoint.
-        if detail and "files" in detail:
-            files = detail["files"]
-        else:
-            # fallback - some compare JSON entries may include 'files' already attached; if not, use commit endpoint
-            files = []
-            if sha:
-                # The caller could pass a token and do commit_details; but here we'll set files empty if not present
-                pass
-
-        matched_files = []
-        for f in files:
-            filename = f.get("filename") or f.get("file") or ""
-            if matches_patterns(filename, patterns):
-                matched_files.append({
-                    "filename": filename,
-                    "status": f.get("status"),
-                    "patch": f.get("patch")
-                })
+    client = CachedGitHubClient(make_session(headers))
+    compare_json = compare_refs(client, repo_id, base, head, headers)
 
-        if matched_files:
-            results.append({
-                "sha": sha,
-                "html_url": c.get("html_url") or (compare_json.get("html_url") + f"/commit/{sha}" if compare_json.get("html_url") else None),
-                "author": c.get("commit", {}).get("author", {}).get("name"),
-                "commit_message": c.get("commit", {}).get("message"),
-                "files_changed": matched_files,
-            })
+    # The aggregated 'files' cover the net diff of the whole range. When that list is complete,
+    # match patterns once here; commits then only need a set lookup, and an empty set means
+    # no commit needs to be fetched at all.
+    range_files = compare_json.get("files")
+    packaging_paths = None
+    if range_files is not None and len(range_files) < COMPARE_FILES_LIMIT:
+        # a file renamed within the range appears once, under its new name; earlier commits
+        # touched it under previous_filename, so both names count
+        names = (f.get(key) for f in range_files for key in ("filename", "previous_filename"))
+        packaging_paths = {name for name in names if name and matches_patterns(name, patterns)}
+        if not packaging_paths:
+            return [], packaging_paths
 
-    return results
+    shas = [c.get("sha") for c in compare_json.get("commits", [])]
+    prune_commit_cache()
+    return list(zip(shas, asyncio.run(fetch_commits(repo_id, shas, headers)))), packaging_paths
+
+def _git(path: str, *args: str) -> str:
+    # core.quotePath=false: keep non-ASCII paths verbatim instead of "\303\251"-style quoting
+    return subprocess.run(["git", "-C", path, "-c", "core.quotePath=false", *args],
+                          capture_output=True, text=True, check=True).stdout
+
+def _local_patches(path: str, matched: Dict[str, List[str]]) -> Dict[Tuple[str, str], str]:
+    """
+    Read the hunks for every matched (sha, filename) with a single `git show`.
+    The pathspec is the union of matched files, so each commit's sections are exactly its
+    matched files. Returns { (sha, filename): hunks }, like the GitHub 'patch' field.
+    """
+    paths = sorted({f for files in matched.values() for f in files})
+    # pin the a/ b/ prefixes and plain output whatever diff.noprefix/mnemonicPrefix/color say
+    out = _git(path, "show", "--format=%x1e%H", "--src-prefix=a/", "--dst-prefix=b/",
+               "--no-color", "--no-ext-diff", *matched, "--", *paths)
+    patches = {}
+    for record in out.split("\x1e")[1:]:
+        sha, _, diff = record.partition("\n")
+        # content lines are always prefixed (+/-/space), so only real headers start a line
+        for section in ("\n" + diff).split("\ndiff --git ")[1:]:
+            header, _, body = section.partition("\n")
+            if "@@" in body:
+                patches[(sha, header.rsplit(" b/", 1)[-1])] = body[body.find("@@"):].rstrip("\n")
+    return patches
 
-def commit_details_from_compare(commit_entry: Dict) -> Dict:
+def local_commit_details(path: str, owner_repo: str, base: str, head: str,
+                         patterns: List[str]) -> List[Tuple[str, Dict]]:
     """
-    Some GitHub compare responses embed a commit payload with 'files' already.
-    If commit_entry itself has 'files', return it; else return None (caller can fetch via API).
+    Read the commits in base..head from a local clone, shaped like the GitHub commit JSON
+    main() consumes. Uses at most two git processes: one `git log --name-status` for the
+    range, and one `git show` for the patches of files matching the packaging patterns.
+    Returns (sha, commit dict) pairs, oldest commit first.
     """
-    if "files" in commit_entry:
-        return commit_entry
-    # else None -> caller should call commit endpoint if needed
-    return None
-
-def create_jira_issue(jira_base: str, jira_user: str, jira_api_token: str,
-                      project_key: str, issue_type: str, summary: str,
-                      description: str, assignee: str = None, labels: List[str] = None,
-                      dry_run: bool = True) -> Dict:
+    # --reverse: oldest first, the order the compare API lists commits (and issues get created) in
+    out = _git(path, "log", "--reverse", "--name-status", "--format=%x1e%H%x1f%an%x1f%B%x1f",
+               f"{base}..{head}")
+    results = []
+    matched: Dict[str, List[str]] = {}
+    # each record: sha \x1f author \x1f message \x1f name-status lines
+    for record in out.split("\x1e")[1:]:
+        sha, author, message, name_status = record.split("\x1f", 3)
+        files = []
+        for line in name_status.splitlines():
+            if not line.strip():
+                continue
+            # "M<TAB>path", or "R100<TAB>old<TAB>new" for renames/copies
+            cols = line.split("\t")
+            filename = cols[-1]
+            if matches_patterns(filename, patterns):
+                matched.setdefault(sha, []).append(filename)
+            files.append({
+                "filename": filename,
+                "status": GIT_STATUS_NAMES.get(cols[0][:1], cols[0]),
+                "patch": None,
+            })
+        results.append((sha, {
+            "sha": sha,
+            "html_url": f"https://github.com/{owner_repo}/commit/{sha}",
+            "commit": {"author": {"name": author}, "message": message.strip()},
+            "files": files,
+        }))
+
+    if matched:
+        patches = _local_patches(path, matched)
+        for sha, detail in results:
+            for f in detail["files"]:
+                f["patch"] = patches.get((sha, f["filename"]))
+    return results
+
+def build_issue_payload(project_key: str, issue_type: str, summary: str, description: str,
+                        assignee: str = None, labels: List[str] = None) -> Dict:
     payload = {
         "fields": {
             "project": {"key": project_key},
@@ -147,18 +346,56 @@ def create_jira_issue(jira_base: str, jira_user: str, jira_api_token: str,
         payload["fields"]["labels"] = labels
     if assignee:
         payload["fields"]["assignee"] = {"name": assignee}
+    return payload
+
+def _bulk_response_body(r) -> Dict:
+    """Decode a bulk-create response; a 400 listing per-issue errors is a 'nothing created' result."""
+    from github_api import json_loads
 
+    # Jira answers 400 when every issue in the request fails, with the usual errors body
+    if r.status_code == 400:
+        try:
+            body = json_loads(r.content)
+        except ValueError:
+            body = None
+        if isinstance(body, dict) and body.get("errors"):
+            return body
+    r.raise_for_status()
+    return json_loads(r.content)
+
+def create_jira_issues_bulk(jira_base: str, auth: Tuple[str, str], payloads: List[Dict],
+                            dry_run: bool = True) -> List[Dict]:
+    """
+    Create all issues through /rest/api/2/issue/bulk, JIRA_BULK_LIMIT per request.
+    Returns the created issues ({ 'id', 'key', 'self' }); per-issue failures are reported on stderr.
+    If a request fails outright, the keys created by earlier batches are reported before re-raising.
+    """
     if dry_run:
-        print("[DRY-RUN] Would create Jira issue with payload:")
-        print(payload)
-        return {"mock": True, "payload": payload}
+        print(f"[DRY-RUN] Would create {len(payloads)} Jira issue(s) with payload:")
+        print(json.dumps({"issueUpdates": payloads}, indent=2, ensure_ascii=False))
+        return [{"mock": True, "payload": p} for p in payloads]
+
+    import requests
 
-    url = jira_base.rstrip("/") + "/rest/api/2/issue"
-    auth = (jira_user, jira_api_token)
+    url = jira_base.rstrip("/") + "/rest/api/2/issue/bulk"
     headers = {"Content-Type": "application/json"}
-    r = requests.post(url, auth=auth, headers=headers, json=payload)
-    r.raise_for_status()
-    return r.json()
+    created = []
+    for start in range(0, len(payloads), JIRA_BULK_LIMIT):
+        batch = payloads[start:start + JIRA_BULK_LIMIT]
+        try:
+            r = requests.post(url, auth=auth, headers=headers, json={"issueUpdates": batch})
+            body = _bulk_response_body(r)
+        except (requests.RequestException, ValueError):
+            if created:
+                keys = ", ".join(issue.get("key", "?") for issue in created)
+                print(f"Error: bulk create failed after creating {len(created)} issue(s): {keys}",
+                      file=sys.stderr)
+            raise
+        created.extend(body.get("issues", []))
+        for err in body.get("errors", []):
+            n = start + err.get("failedElementNumber", 0)
+            print(f"Warning: Jira rejected issue #{n + 1}: {err.get('elementErrors')}", file=sys.stderr)
+    return created
 
 def build_issue_description(repo: str, base: str, head: str, commit_info: Dict) -> str:
     lines = []
@@ -173,7 +410,6 @@ def build_issue_description(repo: str, base: str, head: str, commit_info: Dict)
         lines.append(f"* `{f['filename']}` — {f.get('status')}")
         if f.get("patch"):
             # Jira markup for code block
-            patch = textwrap.indent(f["patch"], "    ")
             lines.append("{code}")
             lines.append(f["patch"])
             lines.append("{code}")
@@ -192,6 +428,8 @@ def main():
     p.add_argument("--jira-issuetype", default="Bug", help="Jira issue type (default: Bug)")
     p.add_argument("--jira-assignee", default=None, help="Assignee username (optional)")
     p.add_argument("--jira-labels", nargs="*", default=None, help="Labels to add on created Jira issues")
+    p.add_argument("--local-clone", default=None, metavar="PATH",
+                   help="read commits from this local clone with git instead of the GitHub API")
     args = p.parse_args()
 
     github_token = os.environ.get("GITHUB_TOKEN")
@@ -199,38 +437,45 @@ def main():
     jira_user = os.environ.get("JIRA_USER")
     jira_api_token = os.environ.get("JIRA_API_TOKEN")
 
-    if not github_token:
-        print("Error: GITHUB_TOKEN environment variable is required.", file=sys.stderr)
+    if not github_token and not args.local_clone:
+        print("Error: GITHUB_TOKEN environment variable is required (or pass --local-clone).", file=sys.stderr)
         sys.exit(2)
     if not jira_base or not jira_user or not jira_api_token:
         print("Error: JIRA_BASE, JIRA_USER and JIRA_API_TOKEN environment variables are required.", file=sys.stderr)
         sys.exit(2)
 
-    print(f"Comparing {args.repo}: {args.base} -> {args.head} ...")
-    compare_json = compare_refs(args.repo, args.base, args.head, github_token)
+    packaging_paths = None
+    if args.local_clone:
+        print(f"Reading {args.local_clone}: {args.base}..{args.head} ...")
+        try:
+            details = local_commit_details(args.local_clone, args.repo, args.base, args.head, args.patterns)
+        except (OSError, subprocess.CalledProcessError) as e:
+            print(f"Error: git failed in {args.local_clone}: {getattr(e, 'stderr', None) or e}", file=sys.stderr)
+            sys.exit(2)
+    else:
+        print(f"Comparing {args.repo}: {args.base} -> {args.head} ...")
+        # built once and shared by every GitHub call in the run
+        headers = get_github_headers(github_token)
+        owner, repo = args.repo.split("/")
+        details, packaging_paths = github_commit_details((owner, repo), args.base, args.head,
+                                                         args.patterns, headers)
 
-    # attempt to use aggregated 'files' if present (GitHub compare may provide them)
     packaging_commits = []
-    # First try to get aggregated files from compare_json (some repos/compare calls include 'files')
-    if "files" in compare_json and compare_json["files"]:
-        # if aggregated files present, map files -> commits is harder, so instead fallback to scanning commits individually
-        pass
-
-    # We'll inspect each commit entry for packaging files by fetching commit details.
-    for c in compare_json.get("commits", []):
-        sha = c.get("sha")
-        commit_detail = None
-        try:
-            commit_detail = commit_details(args.repo, sha, github_token)
-        except Exception as e:
-            print(f"Warning: failed to fetch commit {sha}: {e}", file=sys.stderr)
+    for sha, commit_detail in details:
+        if isinstance(commit_detail, Exception):
+            print(f"Warning: failed to fetch commit {sha}: {commit_detail}", file=sys.stderr)
             continue
 
         files = commit_detail.get("files", [])
         matched = []
         for f in files:
             filename = f.get("filename", "")
-            if matches_patterns(filename, args.patterns):
+            # a complete compare file list was matched once; otherwise match each file here
+            if packaging_paths is not None:
+                is_packaging = filename in packaging_paths
+            else:
+                is_packaging = matches_patterns(filename, args.patterns)
+            if is_packaging:
                 matched.append({
                     "filename": filename,
                     "status": f.get("status"),
@@ -250,22 +495,22 @@ def main():
         return
 
     print(f"Found {len(packaging_commits)} commits touching packaging files.")
+    payloads = []
     for ci in packaging_commits:
         summary = f"[packaging] {args.repo} {ci['sha'][:7]} - {ci['commit_message'].splitlines()[0]}"
         description = build_issue_description(args.repo, args.base, args.head, ci)
-        resp = create_jira_issue(
-            jira_base=jira_base,
-            jira_user=jira_user,
-            jira_api_token=jira_api_token,
+        payloads.append(build_issue_payload(
             project_key=args.jira_project,
             issue_type=args.jira_issuetype,
             summary=summary,
             description=description,
             assignee=args.jira_assignee,
             labels=args.jira_labels,
-            dry_run=args.dry_run,
-        )
-        print("Created/Planned Jira issue:", resp.get("key") if isinstance(resp, dict) else resp)
+        ))
+    created = create_jira_issues_bulk(jira_base, (jira_user, jira_api_token), payloads,
+                                      dry_run=args.dry_run)
+    for resp in created:
+        print("Created/Planned Jira issue:", resp.get("key"))
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,110 @@
+"""Tests for the retry policy in .github/scripts/github_api.py."""
+
+import http.server
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import ClassVar
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / ".github" / "scripts"))
+
+import github_api
+
+
+class _PlannedHandler(http.server.BaseHTTPRequestHandler):
+    """Answers each GET with the next (status, headers) in `plan`, then with 200."""
+
+    plan: ClassVar[list] = []
+    hits = 0
+
+    def do_GET(self):
+        type(self).hits += 1
+        status, headers = self.plan.pop(0) if self.plan else (200, {})
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    srv = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _PlannedHandler)
+    threading.Thread(target=srv.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+    _PlannedHandler.plan = []
+    _PlannedHandler.hits = 0
+    yield f"http://127.0.0.1:{srv.server_port}"
+    srv.shutdown()
+    srv.server_close()
+
+
+@pytest.fixture
+def session(server):
+    with patch.object(github_api, "GITHUB_API", server):
+        return github_api.make_session({})
+
+
+class TestGitHubRetry:
+    """Test which responses the session retries, and how long it waits."""
+
+    def _get(self, session, server, plan):
+        _PlannedHandler.plan = list(plan)
+        with patch("time.sleep") as sleep:
+            r = session.get(f"{server}/repos/owner/repo")
+        return r, [c.args[0] for c in sleep.call_args_list]
+
+    def test_permission_403_is_not_retried(self, session, server):
+        """A 403 without rate-limit headers is returned at once."""
+        r, sleeps = self._get(session, server, [(403, {})])
+        assert r.status_code == 403
+        assert _PlannedHandler.hits == 1
+        assert sleeps == []
+
+    def test_primary_limit_403_waits_for_reset(self, session, server):
+        """An exhausted quota is retried once X-RateLimit-Reset has passed."""
+        reset = int(time.time()) + 600
+        headers = {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(reset)}
+        r, sleeps = self._get(session, server, [(403, headers)])
+        assert r.status_code == 200
+        assert _PlannedHandler.hits == 2
+        assert len(sleeps) == 1 and 590 < sleeps[0] <= 600
+
+    def test_secondary_limit_honours_retry_after(self, session, server):
+        """A 403 with Retry-After is retried after exactly that many seconds."""
+        r, sleeps = self._get(session, server, [(403, {"Retry-After": "7"})])
+        assert r.status_code == 200
+        assert sleeps == [7.0]
+
+    def test_exhausted_retries_return_last_response(self, session, server):
+        """Once retries run out the last 5xx is returned, not a RetryError."""
+        r, _ = self._get(session, server, [(502, {})] * (github_api.MAX_RETRIES + 1))
+        assert r.status_code == 502
+        assert _PlannedHandler.hits == github_api.MAX_RETRIES + 1
+
+
+class TestRetryDelay:
+    """Test the delay shared by sync and async callers."""
+
+    def test_retry_after(self):
+        assert github_api.retry_delay({"Retry-After": "3"}, attempt=4) == 3.0
+
+    def test_primary_limit(self):
+        headers = {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(int(time.time()) + 60)}
+        assert 50 < github_api.retry_delay(headers, attempt=0) <= 60
+
+    def test_exponential_backoff(self):
+        assert github_api.retry_delay({}, attempt=3) == github_api.RETRY_BACKOFF * 8
+
+    def test_should_retry(self):
+        assert not github_api.should_retry(403, {})
+        assert github_api.should_retry(403, {"X-RateLimit-Remaining": "0"})
+        assert github_api.should_retry(502, {})
+        assert not github_api.should_retry(404, {})
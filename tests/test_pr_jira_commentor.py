@@ -0,0 +1,95 @@
+"""Tests for the JIRA key lookup in .github/scripts/pr_jira_commentor.py."""
+
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / ".github" / "scripts"))
+
+import pr_jira_commentor  # noqa: E402
+
+PR = {"url": "https://api.github.com/repos/owner/repo/pulls/1", "changed_files": 2}
+
+# The header is line 1 of the patch, the PR only edits line 40, so the hunk's
+# three lines of context never reach the JIRA: line.
+DIFF = b"""diff --git a/patches/0001-fix.patch b/patches/0001-fix.patch
+index 1111111..2222222 100644
+--- a/patches/0001-fix.patch
++++ b/patches/0001-fix.patch
+@@ -37,7 +37,7 @@ Description:
+ context line 37
+ context line 38
+ context line 39
+-old line 40
++new line 40
+ context line 41
+ context line 42
+ context line 43
+"""
+
+PATCH_CONTENTS = b"JIRA: ABC-123\nUpstream: no\n" + b"".join(b"line %d\n" % n for n in range(3, 50))
+
+FILES = [
+    {"filename": "src/main.py", "status": "modified", "raw_url": "https://github.com/raw/main.py"},
+    {"filename": "patches/0001-fix.patch", "status": "modified", "raw_url": "https://github.com/raw/0001-fix.patch"},
+]
+
+
+def _response(status_code=200, body=b""):
+    r = MagicMock()
+    r.ok = status_code < 400
+    r.status_code = status_code
+    r.iter_lines.side_effect = lambda chunk_size=512: iter(body.splitlines())
+    r.__enter__.return_value = r
+    if not r.ok:
+        r.raise_for_status.side_effect = requests.HTTPError(f"{status_code} Client Error")
+    return r
+
+
+def _client(diff_response):
+    client = MagicMock()
+    client.get_all.return_value = FILES
+
+    def get(url, headers=None, stream=False):
+        if url == PR["url"]:
+            return diff_response
+        if url.endswith("0001-fix.patch"):
+            return _response(body=PATCH_CONTENTS)
+        return _response(404)
+
+    client.session.get.side_effect = get
+    return client
+
+
+class TestFindJiraInPatchFiles:
+    """Test locating a JIRA key in a PR's patch files."""
+
+    def test_found_in_diff(self):
+        """A key on a line the diff shows is taken from the diff alone."""
+        diff = DIFF.replace(b"+new line 40", b"+new line 40 for XYZ-9")
+        client = _client(_response(body=diff))
+        with patch.object(pr_jira_commentor, "get_client", return_value=client):
+            assert pr_jira_commentor.find_jira_in_patch_files(PR, "token") == "XYZ-9"
+        client.get_all.assert_not_called()
+
+    def test_header_far_from_change(self):
+        """A header outside the diff context is found by reading the patch file in full."""
+        client = _client(_response(body=DIFF))
+        with patch.object(pr_jira_commentor, "get_client", return_value=client):
+            assert pr_jira_commentor.find_jira_in_patch_files(PR, "token") == "ABC-123"
+        client.get_all.assert_called_once_with(PR["url"] + "/files", 2)
+
+    def test_diff_too_large(self):
+        """A 406 for the diff falls back to the patch files instead of failing."""
+        client = _client(_response(406))
+        with patch.object(pr_jira_commentor, "get_client", return_value=client):
+            assert pr_jira_commentor.find_jira_in_patch_files(PR, "token") == "ABC-123"
+
+    def test_no_key(self):
+        """No key anywhere returns None."""
+        client = _client(_response(body=DIFF))
+        client.get_all.return_value = FILES[:1]
+        with patch.object(pr_jira_commentor, "get_client", return_value=client):
+            assert pr_jira_commentor.find_jira_in_patch_files(PR, "token") is None
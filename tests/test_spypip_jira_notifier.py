@@ -0,0 +1,300 @@
+"""Tests for scripts/spypip_jira_notifier.py."""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import pytest
+import requests
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / ".github" / "scripts"))
+
+import github_api
+import spypip_jira_notifier as notifier
+
+
+class TestGithubCommitDetails:
+    """Test narrowing a compare range down to its packaging files."""
+
+    def _details(self, compare_json, fetch_commits):
+        with patch.object(github_api, "make_session"), \
+                patch.object(github_api, "CachedGitHubClient"), \
+                patch.object(notifier, "compare_refs", return_value=compare_json), \
+                patch.object(notifier, "prune_commit_cache"), \
+                patch.object(notifier, "fetch_commits", new=fetch_commits):
+            return notifier.github_commit_details(("owner", "repo"), "v1", "v2",
+                                                  notifier.DEFAULT_PATTERNS, {})
+
+    def test_renamed_file_keeps_previous_name(self):
+        """A commit that edited a packaging file before it was renamed is still matched."""
+        compare_json = {
+            "files": [
+                {"filename": "requirements/base.txt", "previous_filename": "requirements.txt",
+                 "status": "renamed"},
+                {"filename": "src/main.py", "status": "modified"},
+            ],
+            "commits": [{"sha": "a" * 40}, {"sha": "b" * 40}],
+        }
+        _, packaging_paths = self._details(compare_json, AsyncMock(return_value=[{}, {}]))
+        assert packaging_paths == {"requirements.txt", "requirements/base.txt"}
+
+    def test_no_packaging_files(self):
+        """A range without packaging files fetches no commits."""
+        compare_json = {"files": [{"filename": "src/main.py"}], "commits": [{"sha": "a" * 40}]}
+        fetch_commits = AsyncMock()
+        assert self._details(compare_json, fetch_commits) == ([], set())
+        fetch_commits.assert_not_called()
+
+
+class TestCommitCache:
+    """Test serving commit details from the on-disk commit cache."""
+
+    REPO = ("owner", "repo")
+    SHAS = ("a" * 40, "b" * 40)
+
+    @pytest.mark.asyncio
+    async def test_fully_cached_range_makes_no_requests(self, tmp_path):
+        """A rerun over a range whose commits are all on disk sends nothing to GitHub."""
+        with patch.object(notifier, "COMMIT_CACHE_DIR", tmp_path), \
+                patch.object(notifier, "fetch_all", new=AsyncMock()) as fetch_all:
+            for sha in self.SHAS:
+                notifier.store_cached_commit(self.REPO, sha, {"sha": sha})
+            details = await notifier.fetch_commits(self.REPO, self.SHAS, {})
+        assert details == [{"sha": sha} for sha in self.SHAS]
+        fetch_all.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_only_misses_are_fetched(self, tmp_path):
+        """Cached commits are served from disk; only the rest are requested, then stored."""
+        fetched = {"sha": self.SHAS[1], "files": []}
+        with patch.object(notifier, "COMMIT_CACHE_DIR", tmp_path), \
+                patch.object(notifier, "fetch_all", new=AsyncMock(return_value=[fetched])) as fetch_all:
+            notifier.store_cached_commit(self.REPO, self.SHAS[0], {"sha": self.SHAS[0]})
+            details = await notifier.fetch_commits(self.REPO, self.SHAS, {})
+            assert notifier.load_cached_commit(self.REPO, self.SHAS[1]) == fetched
+        assert details == [{"sha": self.SHAS[0]}, fetched]
+        urls = fetch_all.call_args.args[1]
+        assert urls == [f"{notifier.GITHUB_API}/repos/owner/repo/commits/{self.SHAS[1]}"]
+
+    def test_cache_is_keyed_by_repository(self, tmp_path):
+        """A fork sharing a SHA with upstream does not get upstream's payload."""
+        with patch.object(notifier, "COMMIT_CACHE_DIR", tmp_path):
+            notifier.store_cached_commit(self.REPO, self.SHAS[0], {"sha": self.SHAS[0]})
+            assert notifier.load_cached_commit(("fork", "repo"), self.SHAS[0]) is None
+
+
+class TestFetchAll:
+    """Test the concurrent GitHub fetcher."""
+
+    @pytest.mark.asyncio
+    async def test_without_h2(self):
+        """A plain `pip install httpx` (no h2) falls back to HTTP/1.1 instead of failing."""
+        with patch.object(notifier.importlib.util, "find_spec", return_value=None):
+            assert await notifier.fetch_all(None, [], {}) == []
+
+
+def _git(repo, *args, date="2024-01-01T00:00:00"):
+    """Run git in repo with a fixed identity and commit date."""
+    env = {**os.environ, "GIT_AUTHOR_DATE": date, "GIT_COMMITTER_DATE": date}
+    subprocess.run(["git", "-C", str(repo), "-c", "user.name=Dev Person",
+                    "-c", "user.email=dev@example.com", *args],
+                   check=True, capture_output=True, env=env)
+
+
+@pytest.fixture
+def local_repo(tmp_path):
+    """
+    base (tag v1) -> bump requirements.txt and src/app.py -> rename it to requirements/base.txt,
+    then a branch adding requirements/\u00e9.txt merged back with --no-ff.
+    """
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    _git(repo, "init", "-q", "-b", "main")
+    (repo / "src").mkdir()
+    (repo / "requirements.txt").write_text("requests==2.0\n")
+    (repo / "src" / "app.py").write_text("print('hi')\n")
+    _git(repo, "add", ".")
+    _git(repo, "commit", "-q", "-m", "base")
+    _git(repo, "tag", "v1")
+
+    (repo / "requirements.txt").write_text("requests==2.31\n")
+    (repo / "src" / "app.py").write_text("print('hello')\n")
+    _git(repo, "commit", "-q", "-a", "-m", "Bump requests\n\nNeeded for the CVE fix.\nSee the advisory.",
+         date="2024-01-02T00:00:00")
+    (repo / "requirements").mkdir()
+    _git(repo, "mv", "requirements.txt", "requirements/base.txt")
+    _git(repo, "commit", "-q", "-m", "Move requirements", date="2024-01-03T00:00:00")
+
+    _git(repo, "checkout", "-q", "-b", "pins")
+    (repo / "requirements" / "\u00e9.txt").write_text("idna==3.7\n")
+    _git(repo, "add", ".")
+    _git(repo, "commit", "-q", "-m", "Add accented pins", date="2024-01-04T00:00:00")
+    _git(repo, "checkout", "-q", "main")
+    _git(repo, "merge", "-q", "--no-ff", "-m", "Merge pins", "pins", date="2024-01-05T00:00:00")
+    return repo
+
+
+class TestLocalCommitDetails:
+    """Test reading commits from a local clone with git."""
+
+    def _details(self, repo):
+        return notifier.local_commit_details(str(repo), "owner/repo", "v1", "main",
+                                             notifier.DEFAULT_PATTERNS)
+
+    def test_oldest_first(self, local_repo):
+        """Commits come back in the compare API's order, so Jira issues are created oldest first."""
+        messages = [detail["commit"]["message"].splitlines()[0] for _, detail in self._details(local_repo)]
+        assert messages == ["Bump requests", "Move requirements", "Add accented pins", "Merge pins"]
+
+    def test_commit_shape(self, local_repo):
+        """A normal commit carries its sha, URL, author, full message and every changed file."""
+        sha, detail = self._details(local_repo)[0]
+        assert detail["sha"] == sha
+        assert detail["html_url"] == f"https://github.com/owner/repo/commit/{sha}"
+        assert detail["commit"]["author"]["name"] == "Dev Person"
+        assert detail["commit"]["message"] == "Bump requests\n\nNeeded for the CVE fix.\nSee the advisory."
+        assert [(f["filename"], f["status"]) for f in detail["files"]] == [
+            ("requirements.txt", "modified"),
+            ("src/app.py", "modified"),
+        ]
+
+    def test_rename(self, local_repo):
+        """A rename is reported under its new path."""
+        _, detail = self._details(local_repo)[1]
+        assert [(f["filename"], f["status"]) for f in detail["files"]] == [
+            ("requirements/base.txt", "renamed"),
+        ]
+
+    def test_non_ascii_path(self, local_repo):
+        """Non-ASCII paths are not C-quoted by git."""
+        _, detail = self._details(local_repo)[2]
+        assert [(f["filename"], f["status"]) for f in detail["files"]] == [
+            ("requirements/\u00e9.txt", "added"),
+        ]
+
+    def test_merge(self, local_repo):
+        """A merge commit is listed, with no files of its own."""
+        _, detail = self._details(local_repo)[3]
+        assert detail["commit"]["message"] == "Merge pins"
+        assert detail["files"] == []
+
+
+class TestLocalPatches:
+    """Test reading packaging-file hunks from a local clone with a single git show."""
+
+    def _patches(self, repo):
+        details = notifier.local_commit_details(str(repo), "owner/repo", "v1", "main",
+                                                notifier.DEFAULT_PATTERNS)
+        return [{f["filename"]: f["patch"] for f in detail["files"]} for _, detail in details]
+
+    def test_hunks_per_file(self, local_repo):
+        """Packaging files get their hunks; other files and pure renames get none."""
+        bump, move, pins, merge = self._patches(local_repo)
+        assert bump == {
+            "requirements.txt": "@@ -1 +1 @@\n-requests==2.0\n+requests==2.31",
+            "src/app.py": None,
+        }
+        assert move == {"requirements/base.txt": None}
+        assert pins == {"requirements/\u00e9.txt": "@@ -0,0 +1 @@\n+idna==3.7"}
+        assert merge == {}
+
+    def test_user_diff_config_is_ignored(self, local_repo):
+        """Prefix, colour and path-quoting settings in the clone's config don't change the result."""
+        expected = self._patches(local_repo)
+        for key, value in [("diff.noprefix", "true"), ("diff.mnemonicPrefix", "true"),
+                           ("color.ui", "always"), ("core.quotePath", "true")]:
+            _git(local_repo, "config", key, value)
+        assert self._patches(local_repo) == expected
+
+    def test_diff_header_inside_file_content(self, local_repo):
+        """A 'diff --git' line inside a patched file does not start a new section."""
+        (local_repo / "requirements" / "base.txt").write_text("requests==2.31\ndiff --git a/x b/x\n")
+        _git(local_repo, "commit", "-q", "-a", "-m", "Odd line", date="2024-01-06T00:00:00")
+        assert self._patches(local_repo)[-1] == {
+            "requirements/base.txt": "@@ -1 +1,2 @@\n requests==2.31\n+diff --git a/x b/x",
+        }
+
+
+def _jira_response(status_code, body):
+    r = requests.Response()
+    r.status_code = status_code
+    r._content = body if isinstance(body, bytes) else json.dumps(body).encode()
+    r.url = "https://jira.example.com/rest/api/2/issue/bulk"
+    return r
+
+
+class TestCreateJiraIssuesBulk:
+    """Test bulk issue creation, which decides whether a rerun duplicates issues."""
+
+    PAYLOADS = tuple({"fields": {"summary": f"issue {n}"}} for n in range(5))
+
+    def _create(self, *responses):
+        with patch.object(notifier, "JIRA_BULK_LIMIT", 2), \
+                patch("requests.post", side_effect=list(responses)) as post:
+            created = notifier.create_jira_issues_bulk("https://jira.example.com/", ("user", "token"),
+                                                       list(self.PAYLOADS), dry_run=False)
+        return created, post
+
+    def test_batches(self):
+        """Payloads are posted JIRA_BULK_LIMIT at a time and every created issue is returned."""
+        created, post = self._create(
+            _jira_response(201, {"issues": [{"key": "ENG-1"}, {"key": "ENG-2"}], "errors": []}),
+            _jira_response(201, {"issues": [{"key": "ENG-3"}, {"key": "ENG-4"}], "errors": []}),
+            _jira_response(201, {"issues": [{"key": "ENG-5"}], "errors": []}),
+        )
+        assert [issue["key"] for issue in created] == ["ENG-1", "ENG-2", "ENG-3", "ENG-4", "ENG-5"]
+        assert [len(c.kwargs["json"]["issueUpdates"]) for c in post.call_args_list] == [2, 2, 1]
+        assert post.call_args.args[0] == "https://jira.example.com/rest/api/2/issue/bulk"
+
+    def test_partial_failure_offsets(self, capsys):
+        """failedElementNumber is relative to its batch; the warning names the overall issue."""
+        created, _ = self._create(
+            _jira_response(201, {"issues": [{"key": "ENG-1"}, {"key": "ENG-2"}], "errors": []}),
+            _jira_response(201, {"issues": [{"key": "ENG-3"}],
+                                 "errors": [{"failedElementNumber": 1, "elementErrors": {"x": "bad"}}]}),
+            _jira_response(201, {"issues": [{"key": "ENG-4"}], "errors": []}),
+        )
+        assert [issue["key"] for issue in created] == ["ENG-1", "ENG-2", "ENG-3", "ENG-4"]
+        assert "Jira rejected issue #4" in capsys.readouterr().err
+
+    def test_whole_batch_rejected_continues(self, capsys):
+        """Jira's 400 for a batch where every issue failed is reported, and later batches still run."""
+        created, post = self._create(
+            _jira_response(201, {"issues": [{"key": "ENG-1"}, {"key": "ENG-2"}], "errors": []}),
+            _jira_response(400, {"issues": [], "errors": [
+                {"failedElementNumber": 0, "elementErrors": {"x": "bad"}},
+                {"failedElementNumber": 1, "elementErrors": {"x": "bad"}},
+            ]}),
+            _jira_response(201, {"issues": [{"key": "ENG-3"}], "errors": []}),
+        )
+        assert [issue["key"] for issue in created] == ["ENG-1", "ENG-2", "ENG-3"]
+        assert post.call_count == 3
+        err = capsys.readouterr().err
+        assert "Jira rejected issue #3" in err and "Jira rejected issue #4" in err
+
+    def test_failure_reports_keys_created_so_far(self, capsys):
+        """A request that fails outright re-raises, after listing the issues already created."""
+        with pytest.raises(requests.HTTPError):
+            self._create(
+                _jira_response(201, {"issues": [{"key": "ENG-1"}, {"key": "ENG-2"}], "errors": []}),
+                _jira_response(500, b"Internal Server Error"),
+            )
+        assert "after creating 2 issue(s): ENG-1, ENG-2" in capsys.readouterr().err
+
+    def test_400_without_errors_raises(self, capsys):
+        """A 400 that is not a per-issue error report (e.g. a malformed request) is not swallowed."""
+        with pytest.raises(requests.HTTPError):
+            self._create(_jira_response(400, {"errorMessages": ["bad request"]}))
+        assert "after creating" not in capsys.readouterr().err
+
+    def test_dry_run_posts_nothing(self):
+        """A dry run only prints the payloads."""
+        with patch("requests.post") as post:
+            created = notifier.create_jira_issues_bulk("https://jira.example.com", ("user", "token"),
+                                                       list(self.PAYLOADS), dry_run=True)
+        post.assert_not_called()
+        assert [c["payload"] for c in created] == list(self.PAYLOADS)